@@ -6,87 +6,446 @@ import os
 import tempfile
 import csv
 import re
+import uuid
+import queue
+import threading
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 # --- CONFIGURATION ---
 UCANACCESS_DIR = os.path.abspath("UCanAccess-5.0.1.bin")
+INSERT_BATCH_SIZE = 10000 # Rows handed to each executemany() call
+# Tables exported concurrently; set ACCESS_TO_SQLITE_WORKERS to opt in to more than one.
+# Each extra worker boots its own UCanAccess console, i.e. another JVM holding an in-memory
+# copy of the database, so memory use and start-up time grow with this number.
+MAX_EXPORT_WORKERS = max(1, int(os.environ.get('ACCESS_TO_SQLITE_WORKERS') or 1))
+FEED_QUEUE_SIZE = 4 # Row batches buffered per table between exporter and writer
+FEED_PUT_TIMEOUT = 0.5 # Seconds a producer waits on a full feed before checking for cancellation
+PIPE_BUFFER_SIZE = 1 << 18 # Read buffer for console output and CSV export streams
 
-def run_ucanaccess_command(db_file, command):
-    """Runs a command in the UCanAccess console and returns the output."""
-    console_script = os.path.join(UCANACCESS_DIR, 'console.sh')
-    if not os.path.exists(console_script):
-        print(f"Error: UCanAccess console script not found at {console_script}")
-        sys.exit(1)
+# PRAGMAs for the one-shot bulk load. synchronous=OFF is only safe because the
+# output file is rebuilt from scratch: a crash mid-conversion means rerunning it.
+BULK_LOAD_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=OFF;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-262144;
+PRAGMA locking_mode=EXCLUSIVE;
+"""
+# Restored once all data is committed; the result goes back to a rollback journal
+# so it can be read from read-only locations without -wal/-shm files.
+FINALIZE_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA wal_checkpoint(TRUNCATE);
+PRAGMA journal_mode=DELETE;
+"""
 
-    full_command = f"{db_file}\n{command}\nquit;\n"
-    try:
-        proc = subprocess.run(
+# Header rows of the information_schema result tables printed by the console.
+_TABLES_HEADER = ['TABLE_NAME']
+_COLUMNS_HEADER = ['COLUMN_NAME', 'DATA_TYPE', 'IS_NULLABLE']
+
+# Access type families in priority order: the first family with a token
+# anywhere in the type name wins (so e.g. LONGCHAR is TEXT, not INTEGER).
+_TYPE_RE = re.compile(
+    r'^(?:(?=.*(?:CHAR|TEXT|MEMO|STRING))(?P<text>)'
+    r'|(?=.*(?:INT|LONG|BYTE|COUNTER))(?P<integer>)'
+    r'|(?=.*(?:DOUBLE|FLOAT|SINGLE))(?P<real>)'
+    r'|(?=.*DATETIME)(?P<datetime>)'
+    r'|(?=.*CURRENCY)(?P<currency>)'
+    r'|(?=.*BIT)(?P<bit>)'
+    r'|(?=.*(?:OLE|BINARY))(?P<blob>))'
+)
+_TYPE_MAP = {
+    'text': 'TEXT',
+    'integer': 'INTEGER',
+    'real': 'REAL',
+    'datetime': 'DATETIME',
+    'currency': 'NUMERIC',
+    'bit': 'INTEGER', # Boolean
+    'blob': 'BLOB',
+}
+
+# Exact type names, resolved once at import; anything else goes through _TYPE_RE.
+_TYPE_TABLE = {}
+for _name in ('VARCHAR', 'CHAR', 'CHARACTER', 'CHARACTER VARYING', 'LONGVARCHAR', 'NVARCHAR',
+              'TEXT', 'MEMO', 'LONGCHAR', 'STRING'):
+    _TYPE_TABLE[_name] = 'TEXT'
+for _name in ('INTEGER', 'INT', 'SMALLINT', 'TINYINT', 'BIGINT', 'LONG', 'BYTE', 'COUNTER', 'BIT'):
+    _TYPE_TABLE[_name] = 'INTEGER'
+for _name in ('DOUBLE', 'FLOAT', 'SINGLE'):
+    _TYPE_TABLE[_name] = 'REAL'
+_TYPE_TABLE['DATETIME'] = 'DATETIME'
+_TYPE_TABLE['CURRENCY'] = 'NUMERIC'
+for _name in ('OLE', 'BINARY', 'VARBINARY'):
+    _TYPE_TABLE[_name] = 'BLOB'
+del _name
+# Length/precision suffix ignored for the table lookup, e.g. VARCHAR(255) or NUMERIC(10, 2)
+_SIZE_SUFFIX_RE = re.compile(r'\s*\(\s*\d+(?:\s*,\s*\d+)?\s*\)$')
+
+def map_type(access_type):
+    """Maps an Access data type to a SQLite data type."""
+    access_type = access_type.strip().upper()
+    key = _SIZE_SUFFIX_RE.sub('', access_type) if '(' in access_type else access_type
+    sqlite_type = _TYPE_TABLE.get(key)
+    if sqlite_type:
+        return sqlite_type
+    match = _TYPE_RE.match(access_type)
+    if not match:
+        return 'TEXT' # Default fallback
+    return _TYPE_MAP[match.lastgroup]
+
+def parse_console_rows(output):
+    """Returns the stripped cells of every '| a | b |' result row in console output."""
+    # A row may be preceded by the console prompt on the same line.
+    pipe_lines = [line[line.index('|'):] for line in output.splitlines() if '|' in line]
+    reader = csv.reader(pipe_lines, delimiter='|', quoting=csv.QUOTE_NONE)
+    return [[cell.strip() for cell in row[1:-1]] for row in reader]
+
+def chunked(iterable, n=INSERT_BATCH_SIZE):
+    """Yields lists of up to n items from iterable."""
+    buf = []
+    for item in iterable:
+        buf.append(item)
+        if len(buf) >= n:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+class UCanAccessSession:
+    """A long-lived UCanAccess console, so the JVM boots and loads the database only once."""
+
+    # Column alias of the marker query appended to every command.
+    MARKER = 'END_OF_CMD'
+
+    def __init__(self, db_file):
+        console_script = os.path.join(UCANACCESS_DIR, 'console.sh')
+        if not os.path.exists(console_script):
+            print(f"Error: UCanAccess console script not found at {console_script}")
+            sys.exit(1)
+
+        # Own process group, so kill() also reaches the JVM that console.sh starts.
+        self.proc = subprocess.Popen(
             ['sh', console_script],
-            input=full_command, capture_output=True, text=True, encoding='utf-8', errors='replace'
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace', bufsize=PIPE_BUFFER_SIZE,
+            start_new_session=True
         )
-        if proc.returncode != 0:
-            print(f"Error running UCanAccess command. STDERR: {proc.stderr}")
-        return proc.stdout
-    except Exception as e:
-        print(f"An unexpected error occurred while running UCanAccess: {e}")
-        return ""
+        self.killed = False
+        self._send(f"{db_file}\n")
+
+    def _send(self, text):
+        try:
+            self.proc.stdin.write(text)
+            self.proc.stdin.flush()
+            return True
+        except OSError as e:
+            print(f"An unexpected error occurred while running UCanAccess: {e}")
+            return False
+
+    def run(self, command):
+        """Runs a command in the UCanAccess console and returns its output."""
+        nonce = uuid.uuid4().hex
+        token = f"{self.MARKER}_{nonce}"
+        # The token is built by concatenation so it only ever appears in the query result.
+        marker_sql = (f"SELECT '{self.MARKER}_' || '{nonce}' AS {self.MARKER} "
+                      "FROM information_schema.schemata WHERE SCHEMA_NAME='PUBLIC';")
+        if not self._send(f"{command}\n{marker_sql}\n"):
+            return ""
+
+        lines = []
+        for line in self.proc.stdout:
+            if token in line:
+                break
+            lines.append(line)
+        else:
+            if not self.killed:
+                print("Error running UCanAccess command: the console exited unexpectedly.")
 
-def get_access_tables(db_file):
+        # Drop the marker query's own header lines.
+        for i, line in enumerate(lines):
+            if self.MARKER in line:
+                del lines[i:]
+                break
+        return ''.join(lines)
+
+    @contextmanager
+    def export(self, table, pipe_path):
+        """Exports a table as CSV through a named pipe and yields its read end as a text stream."""
+        os.mkfifo(pipe_path)
+        # Open the read end without waiting for a writer, then hold a write end ourselves
+        # so the reader only sees EOF once the export command has finished.
+        read_fd = os.open(pipe_path, os.O_RDONLY | os.O_NONBLOCK)
+        hold_fd = os.open(pipe_path, os.O_WRONLY)
+        os.set_blocking(read_fd, True)
+
+        def run_export():
+            try:
+                self.run(f'export -t "{table}" "{pipe_path}";')
+            finally:
+                os.close(hold_fd)
+
+        exporter = threading.Thread(target=run_export)
+        exporter.start()
+        try:
+            with open(read_fd, 'r', buffering=PIPE_BUFFER_SIZE, encoding='utf-8', errors='replace', newline='') as f:
+                yield f
+        finally:
+            exporter.join()
+            os.remove(pipe_path)
+
+    def kill(self):
+        """Kills the console and its JVM; a command blocked on its output returns at once."""
+        self.killed = True
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+    def quit(self):
+        """Closes the console and waits for the JVM to exit."""
+        if self.killed:
+            self.proc.wait()
+            return
+        self._send("quit;\n")
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        self.proc.stdout.read()
+        if self.proc.wait() != 0:
+            print(f"Error running UCanAccess command. Exit code: {self.proc.returncode}")
+
+def get_access_tables(session):
     """Returns a list of table names from an Access file."""
     print("  - Getting table list from Access file...")
     sql_command = "SELECT TABLE_NAME FROM information_schema.tables WHERE TABLE_SCHEMA='PUBLIC';"
-    output = run_ucanaccess_command(db_file, sql_command)
-    tables = re.findall(r'\|\s*([^|\s]+)\s*\|', output)
-    # The regex might pick up the header, so we filter it out.
-    return [t for t in tables if t != 'TABLE_NAME']
+    output = session.run(sql_command)
+    # The result header is parsed like any other row, so we filter it out.
+    return [row[0] for row in parse_console_rows(output) if len(row) == 1 and row[0] and row != _TABLES_HEADER]
 
-def get_table_schema_from_access(db_file, table_name):
+def get_table_schema_from_access(session, table_name, log=print):
     """Gets column definitions for a table from Access."""
-    print(f"  - Getting schema for table '{table_name}'...")
+    log(f"  - Getting schema for table '{table_name}'...")
     sql = f"SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE FROM information_schema.columns WHERE TABLE_NAME = '{table_name.upper()}' ORDER BY ORDINAL_POSITION;"
-    output = run_ucanaccess_command(db_file, sql)
+    output = session.run(sql)
     
-    # Regex to find the column data from the messy output
-    # Looks for | COL_NAME | TYPE | NULLABLE |
-    columns_raw = re.findall(r'\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|', output)
+    # Rows of the form | COL_NAME | TYPE | NULLABLE |
+    columns_raw = [row for row in parse_console_rows(output) if len(row) == 3 and all(row)]
 
     if not columns_raw:
-        print(f"  - WARNING: Could not retrieve schema for table '{table_name}'. It may be a view or query.")
+        log(f"  - WARNING: Could not retrieve schema for table '{table_name}'. It may be a view or query.")
         return None
 
-    # Filter out headers
-    columns_raw = [c for c in columns_raw if c[0].strip() != 'COLUMN_NAME']
-
-    # Map Access data types to SQLite data types
-    def map_type(access_type):
-        access_type = access_type.upper()
-        if any(t in access_type for t in ['CHAR', 'TEXT', 'MEMO', 'STRING']):
-            return 'TEXT'
-        if any(t in access_type for t in ['INT', 'LONG', 'BYTE', 'COUNTER']):
-            return 'INTEGER'
-        if any(t in access_type for t in ['DOUBLE', 'FLOAT', 'SINGLE']):
-            return 'REAL'
-        if 'DATETIME' in access_type:
-            return 'DATETIME'
-        if 'CURRENCY' in access_type:
-            return 'NUMERIC'
-        if 'BIT' in access_type:
-            return 'INTEGER' # Boolean
-        if 'OLE' in access_type or 'BINARY' in access_type:
-            return 'BLOB'
-        return 'TEXT' # Default fallback
+    # Filter out headers (the whole header row, so a column named e.g. TABLE_NAME is kept)
+    columns_raw = [c for c in columns_raw if c != _COLUMNS_HEADER]
 
     column_defs = []
     for name, dtype, nullable in columns_raw:
         name = name.strip()
         sqlite_type = map_type(dtype.strip())
         is_nullable = nullable.strip().upper()
-        col_def = f'"{name}" {sqlite_type}'
+        parts = ['"', name, '" ', sqlite_type]
         if is_nullable == 'NO':
-            col_def += ' NOT NULL'
-        column_defs.append(col_def)
+            parts.append(' NOT NULL')
+        column_defs.append(''.join(parts))
 
     return column_defs
 
+class ExportCancelled(Exception):
+    """Raised in a producer once the conversion has been cancelled."""
+
+class ThreadSessions:
+    """Gives each worker thread its own UCanAccessSession, since a console is not thread-safe."""
+
+    def __init__(self, db_file, spare=None):
+        self.db_file = db_file
+        self.cancelled = threading.Event()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # An already running console (e.g. the one that listed the tables) goes to the first worker.
+        self._spare = spare
+        self._sessions = [spare] if spare else []
+
+    def get(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            if self.cancelled.is_set():
+                raise ExportCancelled()
+            with self._lock:
+                session, self._spare = self._spare, None
+            if session is None:
+                session = UCanAccessSession(self.db_file)
+                with self._lock:
+                    self._sessions.append(session)
+                    if self.cancelled.is_set():
+                        session.kill()
+                        raise ExportCancelled()
+            self._local.session = session
+        return session
+
+    def put(self, feed, item):
+        """Puts item on feed, giving up with ExportCancelled once the conversion is cancelled."""
+        while not self.cancelled.is_set():
+            try:
+                feed.put(item, timeout=FEED_PUT_TIMEOUT)
+                return
+            except queue.Full:
+                pass
+        raise ExportCancelled()
+
+    def cancel(self):
+        """Stops all producers: blocked puts give up and every console is killed."""
+        with self._lock:
+            self.cancelled.set()
+            for session in self._sessions:
+                session.kill()
+
+    def quit_all(self):
+        for session in self._sessions:
+            session.quit()
+
+def export_table(sessions, temp_dir, table, feed):
+    """
+    Producer: exports one Access table and streams it to the writer through `feed`.
+    Messages are ('log', text), ('create', sql), ('insert', sql), ('rows', (batch, row_numbers))
+    and ('abort', None); None always marks the end of the table. row_numbers holds the
+    1-based position of each batch row in the export, counting rows skipped here too. Progress is sent as 'log'
+    messages so the writer prints it under the right table header.
+    """
+    def put(item):
+        sessions.put(feed, item)
+
+    def log(message):
+        put(('log', message))
+
+    try:
+        session = sessions.get()
+
+        # 1. Get schema for the SQLite table
+        column_defs = get_table_schema_from_access(session, table, log)
+        if not column_defs:
+            log(f"  - Skipping '{table}' (could not determine schema, likely a view).")
+            return
+        put(('create', 'CREATE TABLE "' + table + '" (' + ', '.join(column_defs) + ')'))
+
+        # 2. Stream the CSV export straight from UCanAccess, without a temporary file
+        log(f"  - Exporting '{table}' to CSV...")
+        with session.export(table, os.path.join(temp_dir, f"{table}.csv")) as f:
+            reader = csv.reader(f, delimiter=';')
+            header = next(reader, None) # Get header to match with schema
+            if sessions.cancelled.is_set():
+                raise ExportCancelled()
+            if header is None:
+                log(f"  - WARNING: CSV export was empty for table '{table}'.")
+                return
+
+            placeholders = ', '.join(['?' for _ in header])
+            put(('insert', f'INSERT INTO "{table}" VALUES ({placeholders})'))
+
+            # Decide once per table which columns keep empty strings (TEXT/DATETIME);
+            # every other column stores an empty value as NULL.
+            def_by_name = {d.split('"')[1]: d.upper() for d in column_defs}
+            aligned_defs = [def_by_name.get(col_name, "") for col_name in header]
+            keep_empty = [('TEXT' in d or 'DATETIME' in d) for d in aligned_defs]
+
+            def rows():
+                for row_number, row in enumerate(reader, 1):
+                    if len(row) != len(header):
+                        log(f"    - WARNING: Skipping row {row_number} with incorrect column count: {row}")
+                        continue
+                    yield row_number, [v if (keep_empty[i] or v != '') else None for i, v in enumerate(row)]
+
+            for chunk in chunked(rows()):
+                row_numbers, batch = zip(*chunk)
+                put(('rows', (batch, row_numbers)))
+
+    except ExportCancelled:
+        pass
+    except Exception as e:
+        if not sessions.cancelled.is_set(): # Otherwise the console was killed on purpose
+            try:
+                log(f"  - An unexpected error occurred while importing table '{table}' from CSV: {e}")
+                put(('abort', None))
+            except ExportCancelled:
+                pass
+    finally:
+        try:
+            put(None)
+        except ExportCancelled:
+            pass # Nobody reads the feed any more
+
+def find_failing_row(conn, insert_sql, batch):
+    """Replays a failed batch row by row inside a savepoint; returns (index, row, error) of the first failure."""
+    conn.execute("SAVEPOINT find_failing_row")
+    try:
+        for i, row in enumerate(batch):
+            try:
+                conn.execute(insert_sql, row)
+            except sqlite3.Error as e:
+                return i, row, e
+        return None
+    finally:
+        conn.execute("ROLLBACK TO find_failing_row")
+        conn.execute("RELEASE find_failing_row")
+
+def write_table(conn, table, feed):
+    """Writer: applies one table's messages from `feed` to SQLite and returns the rows imported."""
+    rows_in_table = 0
+    imported = False
+    failed = False
+    for kind, payload in iter(feed.get, None):
+        if kind == 'log':
+            print(payload)
+            continue
+        if failed:
+            continue # Keep draining so the producer never blocks on a full queue
+        if kind == 'create':
+            try:
+                print(f"  - Creating table '{table}' in SQLite...")
+                conn.execute(payload)
+            except sqlite3.OperationalError as e:
+                print(f"  - ERROR creating table '{table}': {e}")
+                failed = True
+            continue
+        try:
+            if kind == 'insert':
+                # One explicit transaction per table, filled in bounded batches.
+                insert_sql = payload
+                conn.execute("BEGIN IMMEDIATE")
+                imported = True
+            elif kind == 'rows':
+                batch, row_numbers = payload
+                try:
+                    conn.executemany(insert_sql, batch)
+                except sqlite3.Error as e:
+                    failed = True
+                    failing = find_failing_row(conn, insert_sql, batch)
+                    if failing:
+                        i, row, row_error = failing
+                        print(f"  - ERROR inserting row {row_numbers[i]} of the export into table '{table}': {row_error}")
+                        print(f"    - Row: {row}")
+                    else:
+                        print(f"  - ERROR inserting the batch starting at row {row_numbers[0]} of the export into table '{table}': {e}")
+                    continue
+                rows_in_table += len(batch)
+            elif kind == 'abort':
+                failed = True
+        except sqlite3.Error as e:
+            print(f"  - ERROR writing table '{table}' to SQLite: {e}")
+            failed = True
+
+    if failed:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+            print(f"  - Rolled back table '{table}': none of its rows were imported.")
+        return 0
+    if imported:
+        conn.execute("COMMIT")
+        print(f"  - Successfully imported {rows_in_table} rows.")
+    return rows_in_table
+
 def convert_access_to_sqlite(access_file, sqlite_file):
     if not os.path.exists(access_file):
         print(f"Error: Access file not found at '{access_file}'")
@@ -96,87 +455,51 @@ def convert_access_to_sqlite(access_file, sqlite_file):
         os.remove(sqlite_file)
 
     print(f"Connecting to new SQLite database: {sqlite_file}")
-    conn = sqlite3.connect(sqlite_file)
-    cursor = conn.cursor()
+    # The connection's statement cache keeps each prepared INSERT across batches.
+    # isolation_level=None: no implicit transactions, write_table opens and closes them.
+    # detect_types=0: no converters; rows are bound as plain str/None values.
+    conn = sqlite3.connect(sqlite_file, detect_types=0, isolation_level=None, cached_statements=256)
+    conn.executescript(BULK_LOAD_PRAGMAS)
 
-    tables = get_access_tables(access_file)
+    session = UCanAccessSession(access_file)
+    tables = get_access_tables(session)
     if not tables:
         print("No tables found in the Access file. Exiting.")
+        session.quit()
         conn.close()
         return
 
     print(f"Found {len(tables)} tables/views. Attempting to convert...")
 
+    # Exports run in parallel worker threads (each with its own console);
+    # this thread is the only SQLite writer and takes the tables in order.
+    sessions = ThreadSessions(access_file, spare=session)
+    workers = min(os.cpu_count() or 1, MAX_EXPORT_WORKERS, len(tables))
+    total_rows_imported = 0
     with tempfile.TemporaryDirectory() as temp_dir:
-        total_rows_imported = 0
-        for table in tables:
-            print(f"\n--- Processing: {table} ---")
-            
-            # 1. Get schema and create table in SQLite
-            column_defs = get_table_schema_from_access(access_file, table)
-            if not column_defs:
-                print(f"  - Skipping '{table}' (could not determine schema, likely a view).")
-                continue
-
-            create_table_sql = f'CREATE TABLE "{table}" ({ ", ".join(column_defs) })'
-            try:
-                print(f"  - Creating table '{table}' in SQLite...")
-                cursor.execute(create_table_sql)
-            except sqlite3.OperationalError as e:
-                print(f"  - ERROR creating table '{table}': {e}")
-                continue
-
-            # 2. Export data to CSV
-            csv_file_path = os.path.join(temp_dir, f"{table}.csv")
-            print(f"  - Exporting data to CSV...")
-            export_command = f'export -t "{table}" "{csv_file_path}";'
-            run_ucanaccess_command(access_file, export_command)
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            feeds = [queue.Queue(maxsize=FEED_QUEUE_SIZE) for _ in tables]
+            for table, feed in zip(tables, feeds):
+                pool.submit(export_table, sessions, temp_dir, table, feed)
 
-            if not os.path.exists(csv_file_path) or os.path.getsize(csv_file_path) == 0:
-                print(f"  - WARNING: CSV file was not created or is empty for table '{table}'.")
-                continue
+            for table, feed in zip(tables, feeds):
+                print(f"\n--- Processing: {table} ---")
+                total_rows_imported += write_table(conn, table, feed)
+        except BaseException:
+            # Ctrl-C or a writer failure: nobody reads the feeds any more, so stop the
+            # producers and their consoles instead of waiting for them.
+            print("\nConversion interrupted, stopping exports...")
+            sessions.cancel()
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            sessions.quit_all()
 
-            # 3. Import data from CSV
-            try:
-                with open(csv_file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    reader = csv.reader(f, delimiter=';')
-                    header = next(reader) # Get header to match with schema
-                    
-                    placeholders = ', '.join(['?' for _ in header])
-                    insert_sql = f'INSERT INTO "{table}" VALUES ({placeholders})'
-                    
-                    rows_in_table = 0
-                    for row in reader:
-                        if len(row) != len(header):
-                            print(f"    - WARNING: Skipping row with incorrect column count: {row}")
-                            continue
-                        
-                        # Handle empty strings for non-TEXT columns by turning them to NULL
-                        processed_row = []
-                        for i, value in enumerate(row):
-                            col_name_in_header = header[i]
-                            # Find corresponding column definition
-                            col_def_str = next((s for s in column_defs if s.strip().startswith(f'"{col_name_in_header}"')), "")
-                            
-                            if value == '' and 'TEXT' not in col_def_str.upper() and 'DATETIME' not in col_def_str.upper():
-                                processed_row.append(None)
-                            else:
-                                processed_row.append(value)
-                        
-                        try:
-                            cursor.execute(insert_sql, processed_row)
-                            rows_in_table += 1
-                        except sqlite3.InterfaceError as e:
-                            print(f"    - ERROR on row: {processed_row}")
-                            print(f"    - {e}")
-
-                    conn.commit()
-                    total_rows_imported += rows_in_table
-                    print(f"  - Successfully imported {rows_in_table} rows.")
-
-            except Exception as e:
-                print(f"  - An unexpected error occurred while importing table '{table}' from CSV: {e}")
 
+    conn.executescript(FINALIZE_PRAGMAS)
     print(f"\nConversion complete. Total rows imported across all tables: {total_rows_imported}")
     conn.close()
 
@@ -6,27 +6,36 @@ from collections import namedtuple
 # A simple structure to hold schema info for a column
 ColumnInfo = namedtuple('ColumnInfo', ['name', 'type', 'notnull', 'default_value', 'pk'])
 
+# SQLite's default limit on the number of terms in a compound SELECT
+MAX_COMPOUND_SELECT = 500
+
 def get_db_schema(cursor):
     """Returns a dictionary describing the database schema."""
     schema = {}
-    tables = cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';").fetchall()
-    for (table_name,) in tables:
-        columns_raw = cursor.execute(f'PRAGMA table_info("{table_name}");').fetchall()
-        columns = {}
-        for col in columns_raw:
-            # col is a tuple: (cid, name, type, notnull, dflt_value, pk)
-            info = ColumnInfo(name=col[1], type=col[2], notnull=col[3], default_value=col[4], pk=col[5])
-            columns[info.name] = info
-        schema[table_name] = columns
+    # One query for all tables: join sqlite_master with the table_info table-valued function
+    columns_raw = cursor.execute(
+        "SELECT m.name, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+        "FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+        "WHERE m.type='table' AND m.name NOT LIKE 'sqlite_%' ORDER BY m.name, p.cid;"
+    ).fetchall()
+    for table_name, *col in columns_raw:
+        # col is a list: [name, type, notnull, dflt_value, pk]
+        info = ColumnInfo(*col)
+        schema.setdefault(table_name, {})[info.name] = info
     return schema
 
 def get_row_counts(cursor):
     """Returns a dictionary with table names and their row counts."""
+    tables = [name for (name,) in cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")]
     counts = {}
-    tables = cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';").fetchall()
-    for (table_name,) in tables:
-        count = cursor.execute(f'SELECT COUNT(*) FROM "{table_name}";').fetchone()[0]
-        counts[table_name] = count
+    # All counts in one UNION ALL statement per MAX_COMPOUND_SELECT tables instead of one query per table
+    for start in range(0, len(tables), MAX_COMPOUND_SELECT):
+        count_sql = " UNION ALL ".join(
+            f'SELECT {i} AS k, COUNT(*) FROM "{tables[i]}"'
+            for i in range(start, min(start + MAX_COMPOUND_SELECT, len(tables)))
+        )
+        for k, count in cursor.execute(count_sql):
+            counts[tables[k]] = count
     return counts
 
 def compare_databases(db1_path, db2_path):
@@ -105,8 +114,8 @@ def compare_databases(db1_path, db2_path):
                 s2 = cols2[orig_col2]
                 
                 # Simple comparison, making type check case-insensitive
-                if s1.name.lower() != s2.name.lower() or \
-                   str(s1.type).lower() != str(s2.type).lower() or \
+                # (names already match: columns were paired by their lower-cased name)
+                if str(s1.type).lower() != str(s2.type).lower() or \
                    s1.notnull != s2.notnull or \
                    s1.pk != s2.pk:
                     print(f"ERROR [{orig_name2}]: Column '{orig_col2}' has a schema mismatch.")
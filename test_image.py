@@ -1,5 +1,6 @@
 
 
+import mmap
 import subprocess
 
 MDB_PATH = 'Northwind.MDB'
@@ -35,19 +36,24 @@ def test_image_extraction():
             f.write(raw_output)
         print("Raw output saved to 'raw_photo_output.bin'")
 
-        # The heuristic: Find the BMP 'BM' header to strip the OLE wrapper
-        bmp_start_index = raw_output.find(b'BM')
-        
-        if bmp_start_index != -1:
-            print(f"BMP header ('BM') found at index: {bmp_start_index}")
-            cleaned_data = raw_output[bmp_start_index:]
-            with open("cleaned_photo.bmp", "wb") as f:
-                f.write(cleaned_data)
-            print("Cleaned BMP data saved to 'cleaned_photo.bmp'")
-        else:
-            print("\n--- ERROR: BMP header ('BM') not found in the raw output! ---")
-            # Print first 100 bytes to see what we got
-            print(f"Start of raw data: {raw_output[:100]}")
+        if not raw_output:
+            print("\n--- ERROR: mdb-sql returned no data! ---")
+            return
+
+        # The heuristic: Find the BMP 'BM' header to strip the OLE wrapper.
+        # Scan the saved file through mmap so the data is not copied again.
+        with open("raw_photo_output.bin", "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw_map:
+            bmp_start_index = raw_map.find(b'BM')
+
+            if bmp_start_index != -1:
+                print(f"BMP header ('BM') found at index: {bmp_start_index}")
+                with open("cleaned_photo.bmp", "wb") as out:
+                    out.write(memoryview(raw_map)[bmp_start_index:])
+                print("Cleaned BMP data saved to 'cleaned_photo.bmp'")
+            else:
+                print("\n--- ERROR: BMP header ('BM') not found in the raw output! ---")
+                # Print first 100 bytes to see what we got
+                print(f"Start of raw data: {raw_map[:100]}")
 
     except FileNotFoundError:
         print("Error: 'mdb-sql' not found. Is mdb-tools installed and in your PATH?")
@@ -6,10 +6,20 @@ import io
 import csv
 import sys
 import os
+import signal
+import tempfile
+from collections import OrderedDict
 from PIL import Image, ImageTk
 
 # Common names for columns that might contain images
 IMAGE_COLUMN_CANDIDATES = ['Photo', 'Picture']
+# Number of rendered records (text + image) kept for quick back-and-forth navigation
+RECORD_CACHE_SIZE = 32
+# How far into an OLE object to look for the embedded image header
+IMAGE_HEADER_SEARCH_LIMIT = 64 * 1024
+
+# Hex-encoded OLE objects are far larger than csv's default field limit
+csv.field_size_limit(sys.maxsize)
 
 # --- Helper function to find the correct case for a table name in an MDB file ---
 def get_original_table_name(mdb_path, table_name_to_find):
@@ -25,6 +35,31 @@ def get_original_table_name(mdb_path, table_name_to_find):
         print(f"Could not get original table names from MDB: {e}")
     return table_name_to_find # Fallback to the name we were given
 
+def index_images_from_mdb(mdb_path, table, key_col, image_col, store):
+    """Exports a table once with mdb-export (hex-encoded binaries), appends every decoded
+    image to the store file and returns a key -> (offset, length) index into it."""
+    command = ['mdb-export', '-b', 'hex', '-D', '%Y-%m-%d %H:%M:%S', mdb_path, table]
+    index = {}
+    store.seek(0, os.SEEK_END)
+    offset = store.tell()
+    with subprocess.Popen(command, stdout=subprocess.PIPE) as process:
+        try:
+            reader = csv.reader(io.TextIOWrapper(process.stdout, encoding='utf-8', newline=''))
+            header = [name.lower() for name in next(reader, [])]
+            key_idx = header.index(key_col.lower())
+            image_idx = header.index(image_col.lower())
+            for row in reader:
+                # bytes.fromhex decodes (and validates) the cell in a single C pass
+                image = bytes.fromhex(row[image_idx])
+                store.write(image)
+                index[row[key_idx]] = (offset, len(image))
+                offset += len(image)
+        finally:
+            process.kill()
+    if process.returncode not in (0, -signal.SIGKILL):
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return index
+
 class MdbImageViewer(tk.Tk):
     def __init__(self, sqlite_path, mdb_path):
         super().__init__()
@@ -40,11 +75,21 @@ class MdbImageViewer(tk.Tk):
         self.title(f"Viewer - {os.path.basename(sqlite_path)}")
         self.geometry("800x600")
 
-        # Data storage
-        self.table_data_cache = {}
+        self.conn = sqlite3.connect(sqlite_path)
+
+        # Data storage: records are read from SQLite one at a time
+        self.record_cache = OrderedDict() # (table, index) -> (text, photo)
         self.current_record_index = -1
         self.current_table = ""
+        self.total_records = 0
+        self.header = ()
         self.image_col = ""
+        self.mdb_table = ""
+        self.key_col = ""
+        self.key_col_idx = -1
+        # Decoded images of each table, extracted from the MDB the first time one is needed
+        self.image_store = tempfile.TemporaryFile()
+        self.image_indexes = {} # table -> {key: (offset, length)}
 
         # --- UI Setup ---
         top_frame = ttk.Frame(self)
@@ -87,62 +132,60 @@ class MdbImageViewer(tk.Tk):
         self.load_table_names()
 
     def load_table_names(self):
-        """Connects to the SQLite DB to get the list of tables."""
+        """Queries the SQLite DB to get the list of tables."""
         try:
-            with sqlite3.connect(self.sqlite_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name;")
-                tables = [row[0] for row in cursor.fetchall() if not row[0].startswith('sqlite_')]
-                self.table_selector['values'] = tables
-                if tables:
-                    self.table_selector.current(0)
-                    self.on_table_select()
+            cursor = self.conn.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name;")
+            tables = [row[0] for row in cursor.fetchall() if not row[0].startswith('sqlite_')]
+            self.table_selector['values'] = tables
+            if tables:
+                self.table_selector.current(0)
+                self.on_table_select()
         except sqlite3.Error as e:
             self.show_error(f"Database Error: {e}")
 
-    def load_data_from_mdb(self, table_name_from_sqlite):
-        """Loads data for a table directly from MDB using mdb-export with hex encoding."""
-        if table_name_from_sqlite in self.table_data_cache:
-            return self.table_data_cache[table_name_from_sqlite]
-
-        # Find the correct, case-sensitive table name from the MDB file
-        correct_table_name = get_original_table_name(self.mdb_path, table_name_from_sqlite)
-        print(f"Loading data for '{correct_table_name}' (found from '{table_name_from_sqlite}') from MDB...")
-
-        try:
-            command = ['mdb-export', '-b', 'hex', '-D', '%Y-%m-%d %H:%M:%S', self.mdb_path, correct_table_name]
-            csv_output = subprocess.check_output(command).decode('utf-8')
-            
-            reader = csv.reader(csv_output.splitlines())
-            header = next(reader)
-            
-            data = [dict(zip(header, row)) for row in reader]
-            self.table_data_cache[table_name_from_sqlite] = data # Cache using the name from SQLite
-            print(f"Successfully loaded and cached {len(data)} records.")
-            return data
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            self.show_error(f"Failed to load data from MDB for table {correct_table_name}.\n\n{e}")
-            return []
-
     def on_table_select(self, event=None):
-        """Loads data for the selected table from the MDB file."""
+        """Reads the record count and columns of the selected table from SQLite."""
         self.current_table = self.table_selector.get()
         if not self.current_table:
             return
 
-        table_data = self.load_data_from_mdb(self.current_table)
         self.image_col = ""
-        if table_data:
-            header = table_data[0].keys()
+        try:
+            self.total_records = self.conn.execute(f'SELECT COUNT(*) FROM "{self.current_table}"').fetchone()[0]
+            cursor = self.conn.execute(f'SELECT * FROM "{self.current_table}" LIMIT 0')
+            self.header = tuple(d[0] for d in cursor.description)
+            pk_cols = [row[1] for row in self.conn.execute(f'PRAGMA table_info("{self.current_table}")') if row[5]]
+        except sqlite3.Error as e:
+            self.total_records = 0
+            self.current_record_index = -1
+            self.update_nav_state()
+            self.show_error(f"Database Error: {e}")
+            return
+
+        if self.total_records:
             # Case-insensitive search for image column
-            for col_name in header:
+            for col_name in self.header:
                 for candidate in IMAGE_COLUMN_CANDIDATES:
                     if col_name.lower() == candidate.lower():
                         self.image_col = col_name
                         break
                 if self.image_col:
                     break
-            
+
+            if self.image_col:
+                # Images are extracted from the MDB per record, keyed by the primary key
+                # (or the first column when the schema does not declare one).
+                self.mdb_table = get_original_table_name(self.mdb_path, self.current_table)
+                self.key_col = pk_cols[0] if pk_cols else self.header[0]
+                self.key_col_idx = self.header.index(self.key_col)
+                if not self.is_unique_key(self.key_col):
+                    print(f"Warning: column '{self.key_col}' does not uniquely identify the records of "
+                          f"'{self.current_table}', images will not be shown for this table.")
+                    self.key_col = ""
+                elif not pk_cols:
+                    print(f"Warning: '{self.current_table}' has no primary key, "
+                          f"matching images on its first column '{self.key_col}'.")
+
             self.current_record_index = 0
             self.display_record()
         else:
@@ -151,19 +194,97 @@ class MdbImageViewer(tk.Tk):
         
         self.update_nav_state()
 
+    def is_unique_key(self, col_name):
+        """Checks in SQLite that a column has a distinct, non-NULL value in every record."""
+        try:
+            distinct, total = self.conn.execute(
+                f'SELECT COUNT(DISTINCT "{col_name}"), COUNT(*) FROM "{self.current_table}"').fetchone()
+        except sqlite3.Error as e:
+            print(f"Could not check the key column '{col_name}': {e}")
+            return False
+        return distinct == total
+
+    def get_image_index(self):
+        """Returns the image index of the current table, building it with one MDB export pass."""
+        if self.current_table not in self.image_indexes:
+            print(f"Extracting images of '{self.mdb_table}' from MDB...")
+            try:
+                index = index_images_from_mdb(self.mdb_path, self.mdb_table, self.key_col,
+                                              self.image_col, self.image_store)
+                print(f"Successfully indexed {len(index)} records.")
+            except (subprocess.CalledProcessError, OSError, ValueError, IndexError, csv.Error) as e:
+                print(f"Failed to extract images from MDB for table {self.mdb_table}: {e}")
+                index = {} # Do not retry the export on every record
+            self.image_indexes[self.current_table] = index
+        return self.image_indexes[self.current_table]
+
+    def load_image(self, record):
+        """Extracts the image of a record from the MDB file and returns it as a PhotoImage."""
+        try:
+            entry = self.get_image_index().get(str(record[self.key_col_idx]))
+            if entry is None or entry[1] == 0:
+                return None
+            offset, length = entry
+            self.image_store.seek(offset)
+            binary_data = self.image_store.read(length)
+            if not binary_data.strip():
+                return None
+
+            # The OLE header from Access wraps the image data.
+            # We look for a common image format header (e.g., BMP, PNG, JFIF for JPEG).
+            img_headers = [b'BM', b'\x89PNG', b'\xff\xd8\xff\xe0']
+            img_start = -1
+            for header in img_headers:
+                # The wrapper is small, so only the start of the payload is searched.
+                img_start = binary_data.find(header, 0, IMAGE_HEADER_SEARCH_LIMIT)
+                if img_start != -1:
+                    break
+
+            if img_start != -1:
+                binary_data = binary_data[img_start:]
+
+            img = Image.open(io.BytesIO(binary_data))
+            img.thumbnail((300, 300))
+            return ImageTk.PhotoImage(img)
+        except Exception as e:
+            print(f"Error processing image data for record: {e}")
+            return None
+
+    def fetch_record(self, index):
+        """Returns the (text, photo) of a record, reading it from SQLite and the MDB on a cache miss."""
+        key = (self.current_table, index)
+        if key in self.record_cache:
+            self.record_cache.move_to_end(key)
+            return self.record_cache[key]
+
+        record = self.conn.execute(f'SELECT * FROM "{self.current_table}" LIMIT 1 OFFSET ?', (index,)).fetchone()
+        if record is None:
+            return None
+
+        text_content = ""
+        for col_name, value in zip(self.header, record):
+            if isinstance(value, bytes):
+                value = f"<{len(value)} bytes>"
+            text_content += f"{col_name}: {value}\n"
+        photo = self.load_image(record) if self.image_col and self.key_col else None
+
+        self.record_cache[key] = (text_content, photo)
+        if len(self.record_cache) > RECORD_CACHE_SIZE:
+            self.record_cache.popitem(last=False)
+        return text_content, photo
+
     def display_record(self):
-        table_data = self.table_data_cache.get(self.current_table, [])
-        if not table_data or self.current_record_index < 0:
+        if self.current_record_index < 0:
             return
 
-        record = table_data[self.current_record_index]
-        
-        text_content = ""
-        hex_image_string = ""
-        for key, value in record.items():
-            if key == self.image_col:
-                hex_image_string = value
-            text_content += f"{key}: {value}\n"
+        try:
+            rendered = self.fetch_record(self.current_record_index)
+        except sqlite3.Error as e:
+            self.show_error(f"Database Error: {e}")
+            return
+        if rendered is None:
+            return
+        text_content, photo = rendered
         
         self.text_data_display.config(state=tk.NORMAL)
         self.text_data_display.delete(1.0, tk.END)
@@ -173,39 +294,16 @@ class MdbImageViewer(tk.Tk):
         self.image_label.config(image='')
         self.no_image_label.pack_forget()
 
-        if hex_image_string:
-            try:
-                binary_data = bytes.fromhex(hex_image_string)
-                
-                # The OLE header from Access wraps the image data.
-                # We look for a common image format header (e.g., BMP, PNG, JFIF for JPEG).
-                img_headers = [b'BM', b'\x89PNG', b'\xff\xd8\xff\xe0']
-                img_start = -1
-                for header in img_headers:
-                    img_start = binary_data.find(header)
-                    if img_start != -1:
-                        break
-                
-                if img_start != -1:
-                    binary_data = binary_data[img_start:]
-
-                img = Image.open(io.BytesIO(binary_data))
-                img.thumbnail((300, 300))
-                photo = ImageTk.PhotoImage(img)
-                
-                self.image_label.config(image=photo)
-                self.image_label.image = photo
-            except Exception as e:
-                print(f"Error processing image data for record: {e}")
-                self.show_no_image_label()
+        if photo is not None:
+            self.image_label.config(image=photo)
+            self.image_label.image = photo
         else:
             self.show_no_image_label()
 
         self.update_nav_state()
 
     def next_record(self):
-        table_data = self.table_data_cache.get(self.current_table, [])
-        if self.current_record_index < len(table_data) - 1:
+        if self.current_record_index < self.total_records - 1:
             self.current_record_index += 1
             self.display_record()
 
@@ -215,7 +313,7 @@ class MdbImageViewer(tk.Tk):
             self.display_record()
             
     def update_nav_state(self):
-        total_records = len(self.table_data_cache.get(self.current_table, []))
+        total_records = self.total_records
         if self.current_record_index != -1:
             self.record_status_label.config(text=f"Record {self.current_record_index + 1} of {total_records}")
         else:
@@ -242,6 +340,8 @@ class MdbImageViewer(tk.Tk):
         self.text_data_display.config(state=tk.DISABLED)
 
     def on_closing(self):
+        self.conn.close()
+        self.image_store.close()
         self.destroy()
 
 if __name__ == "__main__":